@@ -1,280 +1,508 @@
-import os
-import time
-import asyncio
-from datetime import datetime
-from typing import Optional
-import logging
-
-logger = logging.getLogger(__name__)
-
-class CallLogger:
-    """
-    A logging class that creates separate log files for each caller number.
-    Each caller gets their own dedicated log file for efficient logging.
-    This version is specifically for insurance-ai directory.
-    """
-    
-    def __init__(self, log_directory: str = "call-logs"):
-        """
-        Initialize the CallLogger.
-        
-        Args:
-            log_directory (str): Directory where log files will be stored
-        """
-        self.log_directory = log_directory
-        self.file_handles = {}  # Cache for file handles
-        self._ensure_log_directory()
-    
-    def _ensure_log_directory(self):
-        """Create the log directory if it doesn't exist."""
-        try:
-            if not os.path.exists(self.log_directory):
-                os.makedirs(self.log_directory, exist_ok=True)
-                print(f"✅ Created log directory: {self.log_directory}")
-            
-            # Test if directory is writable
-            test_file = os.path.join(self.log_directory, ".test_write")
-            try:
-                with open(test_file, 'w') as f:
-                    f.write("test")
-                os.remove(test_file)
-            except Exception as e:
-                print(f"⚠️ Warning: Log directory {self.log_directory} is not writable: {e}")
-                raise
-                
-        except Exception as e:
-            print(f"❌ Failed to create or verify log directory {self.log_directory}: {e}")
-            raise
-    
-    def _get_log_filename(self, caller_number: str) -> str:
-        """
-        Generate the log filename for a given caller number.
-        
-        Args:
-            caller_number (str): The phone number of the caller
-            
-        Returns:
-            str: The log filename
-        """
-        # Clean the phone number for filename safety
-        safe_number = caller_number.replace('+', '').replace('-', '').replace(' ', '').replace('(', '').replace(')', '')
-        return os.path.join(self.log_directory, f"{safe_number}.txt")
-    
-    def _get_file_handle(self, caller_number: str):
-        """
-        Get or create a file handle for the given caller number.
-        
-        Args:
-            caller_number (str): The phone number of the caller
-            
-        Returns:
-            file: The file handle for appending
-        """
-        if caller_number not in self.file_handles:
-            filename = self._get_log_filename(caller_number)
-            # Open file in append mode with buffering for efficiency
-            self.file_handles[caller_number] = open(filename, 'a', buffering=8192)
-        return self.file_handles[caller_number]
-    
-    def append_log(self, caller_number: str, log_data: str, include_timestamp: bool = True):
-        """
-        Append a log entry to the caller's dedicated log file.
-        
-        Args:
-            caller_number (str): The phone number of the caller
-            log_data (str): The log message to append
-            include_timestamp (bool): Whether to include timestamp in the log entry
-        """
-        try:
-            file_handle = self._get_file_handle(caller_number)
-            
-            if include_timestamp:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                log_entry = f"[{timestamp}] {log_data}\n"
-            else:
-                log_entry = f"{log_data}\n"
-            
-            file_handle.write(log_entry)
-            file_handle.flush()  # Ensure data is written immediately
-            
-            # Force sync to disk to ensure data is persisted
-            try:
-                os.fsync(file_handle.fileno())
-            except:
-                pass  # fsync might fail on some systems, but that's okay
-            
-        except Exception as e:
-            # Fallback to stderr if logging fails
-            print(f"ERROR: Failed to log for caller {caller_number}: {e}", file=os.sys.stderr)
-            # Try to recreate the log entry as a fallback
-            try:
-                self._recreate_log_entry(caller_number, log_data)
-            except:
-                pass
-    
-    
-    def log_event(self, caller_number: str, message: str, global_start_time: Optional[float] = None):
-        """
-        Log an event with optional elapsed time tracking.
-        All file I/O operations happen in parallel in separate threads to reduce latency.
-        
-        Args:
-            caller_number (str): The phone number of the caller
-            message (str): The log message
-            global_start_time (float, optional): Global start time for elapsed time calculation
-        """
-        # Prepare log data
-        if global_start_time is not None:
-            elapsed = time.perf_counter() - global_start_time
-            log_data = f"[{elapsed:8.4f}s] {message}"
-        else:
-            log_data = message
-        
-        # Fire-and-forget logging in separate thread to avoid blocking main execution
-        async def _async_log():
-            try:
-                # Run file I/O operations in separate thread to avoid blocking
-                await asyncio.to_thread(self.append_log, caller_number, log_data, True)
-                
-                # Run verification in separate thread as well
-                await asyncio.to_thread(self._verify_log_written, caller_number, message)
-                
-            except Exception as e:
-                # Fallback logging if async operations fail
-                print(f"ERROR: Async logging failed for caller {caller_number}: {e}", file=os.sys.stderr)
-                try:
-                    # Fallback to synchronous logging
-                    self.append_log(caller_number, log_data, True)
-                    self._verify_log_written(caller_number, message)
-                except Exception as fallback_error:
-                    print(f"ERROR: Fallback logging also failed for caller {caller_number}: {fallback_error}", file=os.sys.stderr)
-        
-        # Always run synchronously for now since async context detection is commented out
-        try:
-            self.append_log(caller_number, log_data, True)
-            self._verify_log_written(caller_number, message)
-        except Exception as e:
-            print(f"ERROR: Synchronous logging failed for caller {caller_number}: {e}", file=os.sys.stderr)
-    
-    def _verify_log_written(self, caller_number: str, message: str):
-        """
-        Verify that the log entry was actually written to the file.
-        If the file doesn't exist, create it and add the log entry.
-        
-        Args:
-            caller_number (str): The phone number of the caller
-            message (str): The message that should have been logged
-        """
-        try:
-            filename = self._get_log_filename(caller_number)
-            
-            # Force flush any pending writes
-            if caller_number in self.file_handles:
-                self.file_handles[caller_number].flush()
-                os.fsync(self.file_handles[caller_number].fileno())
-            
-            # Check if file exists and has content
-            if os.path.exists(filename):
-                if os.path.getsize(filename) > 0:
-                    return True
-                else:
-                    print(f"⚠️ Warning: Log file {filename} exists but is empty - attempting to recreate")
-                    # File exists but is empty, try to recreate the log entry
-                    self._recreate_log_entry(caller_number, message)
-                    return True
-            else:
-                print(f"⚠️ Warning: Log file {filename} was not created - creating it now")
-                # File doesn't exist, create it and add the log entry
-                self._recreate_log_entry(caller_number, message)
-                return True
-                
-        except Exception as e:
-            print(f"⚠️ Warning: Could not verify log file for {caller_number}: {e}")
-            # Try to recreate the log entry as a fallback
-            try:
-                self._recreate_log_entry(caller_number, message)
-                return True
-            except:
-                return False
-    
-    def _recreate_log_entry(self, caller_number: str, message: str):
-        """
-        Recreate a log entry by directly writing to the file.
-        This is a fallback method when the normal logging fails.
-        
-        Args:
-            caller_number (str): The phone number of the caller
-            message (str): The message to log
-        """
-        try:
-            filename = self._get_log_filename(caller_number)
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
-            
-            # Create timestamp
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            log_entry = f"[{timestamp}] {message}\n"
-            
-            # Write directly to file
-            with open(filename, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
-                f.flush()
-                os.fsync(f.fileno())
-            
-            print(f"✅ Recreated log entry for {caller_number} in {filename}")
-            
-        except Exception as e:
-            print(f"❌ Failed to recreate log entry for {caller_number}: {e}")
-    
-    def close_caller_log(self, caller_number: str):
-        """
-        Close the log file for a specific caller.
-        
-        Args:
-            caller_number (str): The phone number of the caller
-        """
-        if caller_number in self.file_handles:
-            try:
-                self.file_handles[caller_number].close()
-                del self.file_handles[caller_number]
-            except Exception as e:
-                print(f"ERROR: Failed to close log for caller {caller_number}: {e}", file=os.sys.stderr)
-    
-    def close_all_logs(self):
-        """Close all open log files."""
-        for caller_number in list(self.file_handles.keys()):
-            self.close_caller_log(caller_number)
-    
-    def __del__(self):
-        """Destructor to ensure all files are closed."""
-        self.close_all_logs()
-    
-    def get_log_file_path(self, caller_number: str) -> str:
-        """
-        Get the full path to a caller's log file.
-        
-        Args:
-            caller_number (str): The phone number of the caller
-            
-        Returns:
-            str: Full path to the log file
-        """
-        return os.path.abspath(self._get_log_filename(caller_number))
-    
-    def log_file_exists_and_has_content(self, caller_number: str) -> bool:
-        """
-        Check if a caller's log file exists and has content.
-        
-        Args:
-            caller_number (str): The phone number of the caller
-            
-        Returns:
-            bool: True if log file exists and has content, False otherwise
-        """
-        try:
-            filename = self._get_log_filename(caller_number)
-            return os.path.exists(filename) and os.path.getsize(filename) > 0
-        except Exception:
-            return False
-  
\ No newline at end of file
+import os
+import sys
+import time
+import queue
+import struct
+import threading
+from functools import lru_cache
+from typing import List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Strips filename-unsafe characters from phone numbers in a single
+# scan instead of one str.replace pass (and allocation) per character
+_SAFE_TBL = str.maketrans("", "", "+-() ")
+
+
+@lru_cache(maxsize=8192)
+def _log_filename(log_directory: str, caller_number: str) -> str:
+    """
+    Compute the legacy per-caller log path. Memoized because the same
+    caller looks up its path many times per call.
+    """
+    return os.path.join(log_directory, caller_number.translate(_SAFE_TBL) + ".txt")
+
+# Group-commit tuning for the background writer thread
+MAX_BATCH = 256       # max entries drained per writer wakeup
+BATCH_WINDOW = 0.005  # seconds to wait for more entries before syncing
+
+# O_DSYNC makes each write durable as part of the write syscall itself,
+# replacing the flush()+fsync() pair; O_APPEND makes appends atomic.
+_LOG_OPEN_FLAGS = (os.O_WRONLY | os.O_APPEND | os.O_CREAT |
+                   getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_DSYNC', 0))
+
+# Binary record header in the aggregate log:
+# payload length, caller id, timestamp in nanoseconds
+_RECORD_HEADER = struct.Struct("<IIQ")
+
+# Kernel cap on iovecs per writev call; sysconf returns -1 (rather than
+# raising) when the name is defined but has no value, so clamp it
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+
+def _write_all(fd: int, data: bytes):
+    """Write data fully, resuming after short writes (e.g. ENOSPC racing
+    a cleanup) so index lines are never left torn."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _writev_all(fd: int, bufs: list):
+    """
+    Gather-write a batch of buffers, splitting at the IOV_MAX cap and
+    resuming after short writes - a partially written length-prefixed
+    record would tear the framing and skew every later index offset.
+    """
+    i = 0
+    partial = None  # unwritten tail of a partially accepted buffer
+    while partial is not None or i < len(bufs):
+        if partial is not None:
+            chunk = [partial] + bufs[i:i + _IOV_MAX - 1]
+        else:
+            chunk = bufs[i:i + _IOV_MAX]
+        written = os.writev(fd, chunk)
+        if written <= 0:
+            raise OSError(f"writev returned {written}")
+        if partial is not None:
+            if written < len(partial):
+                partial = partial[written:]
+                continue
+            written -= len(partial)
+            partial = None
+        while i < len(bufs) and written >= len(bufs[i]):
+            written -= len(bufs[i])
+            i += 1
+        if written:
+            partial = bufs[i][written:]
+            i += 1
+
+class CallLogger:
+    """
+    A logging class that writes all callers into a single aggregate log
+    file with an in-memory per-caller offset index, so the kernel only
+    ever deals with one hot file instead of one file per phone number.
+    This version is specifically for insurance-ai directory.
+    """
+
+    # Cached timestamp state: the "[%Y-%m-%d %H:%M:%S" prefix only changes
+    # once per second, so strftime runs at most once per second instead of
+    # once per log entry; milliseconds are appended with integer formatting.
+    _ts_last_sec: int = 0
+    _ts_prefix: bytes = b""
+
+    def __init__(self, log_directory: str = "call-logs", writer_cpu: Optional[int] = None):
+        """
+        Initialize the CallLogger.
+
+        Args:
+            log_directory (str): Directory where log files will be stored
+            writer_cpu (int, optional): CPU to pin the writer thread to,
+                keeping log I/O off the cores serving calls
+        """
+        self.log_directory = log_directory
+        self._writer_cpu = writer_cpu
+        self._agg_path = os.path.join(log_directory, "calls.log")
+        self._idx_path = os.path.join(log_directory, "calls.idx")
+        # Queue feeding the background writer thread (group commit)
+        self._write_queue = queue.SimpleQueue()
+        self._writer_thread = None
+        self._writer_start_lock = threading.Lock()
+        # caller number <-> sequential caller id, plus record offsets per id
+        self._caller_ids = {}
+        self._caller_numbers = {}
+        self._caller_offsets = {}
+        self._next_caller_id = 1
+        self._id_lock = threading.Lock()
+        self._read_fd = None
+        self._ensure_log_directory()
+        self._agg_fd = os.open(self._agg_path, _LOG_OPEN_FLAGS, 0o644)
+        self._idx_fd = os.open(self._idx_path, _LOG_OPEN_FLAGS, 0o644)
+        self._load_index()
+
+    def _ensure_log_directory(self):
+        """Create the log directory if it doesn't exist."""
+        try:
+            if not os.path.exists(self.log_directory):
+                os.makedirs(self.log_directory, exist_ok=True)
+                print(f"✅ Created log directory: {self.log_directory}")
+
+            # Test if directory is writable
+            test_file = os.path.join(self.log_directory, ".test_write")
+            try:
+                with open(test_file, 'w') as f:
+                    f.write("test")
+                os.remove(test_file)
+            except Exception as e:
+                print(f"⚠️ Warning: Log directory {self.log_directory} is not writable: {e}")
+                raise
+
+        except Exception as e:
+            print(f"❌ Failed to create or verify log directory {self.log_directory}: {e}")
+            raise
+
+    def _load_index(self):
+        """
+        Rebuild the in-memory caller index from the sidecar file.
+        The sidecar holds '# <cid> <caller_number>' registration lines and
+        '<cid> <offset>' record lines, both append-only.
+        """
+        try:
+            with open(self._idx_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    # Parse per line so one torn/garbled entry loses only
+                    # itself, not every caller registered after it
+                    try:
+                        parts = line.split()
+                        if not parts:
+                            continue
+                        if parts[0] == '#' and len(parts) >= 3:
+                            cid = int(parts[1])
+                            # maxsplit keeps caller numbers containing spaces intact
+                            caller_number = line.split(maxsplit=2)[2].rstrip('\n')
+                            self._caller_ids[caller_number] = cid
+                            self._caller_numbers[cid] = caller_number
+                            self._caller_offsets.setdefault(cid, [])
+                            self._next_caller_id = max(self._next_caller_id, cid + 1)
+                        elif len(parts) >= 2:
+                            cid = int(parts[0])
+                            self._caller_offsets.setdefault(cid, []).append(int(parts[1]))
+                    except (ValueError, IndexError) as e:
+                        print(f"⚠️ Warning: Skipping malformed index line {line.rstrip()!r}: {e}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Warning: Could not load log index {self._idx_path}: {e}")
+
+    def _get_log_filename(self, caller_number: str) -> str:
+        """
+        Generate the legacy per-caller log filename for a given caller number.
+        Only consulted for logs written before the aggregate-file format.
+
+        Args:
+            caller_number (str): The phone number of the caller
+
+        Returns:
+            str: The log filename
+        """
+        return _log_filename(self.log_directory, caller_number)
+
+    def _caller_id(self, caller_number: str) -> int:
+        """
+        Get or assign the sequential id for a caller number.
+        New callers are registered in the index sidecar immediately so the
+        mapping survives restarts.
+
+        Args:
+            caller_number (str): The phone number of the caller
+
+        Returns:
+            int: The caller id used in aggregate log records
+        """
+        cid = self._caller_ids.get(caller_number)
+        if cid is not None:
+            return cid
+        with self._id_lock:
+            cid = self._caller_ids.get(caller_number)
+            if cid is None:
+                cid = self._next_caller_id
+                self._next_caller_id += 1
+                self._caller_ids[caller_number] = cid
+                self._caller_numbers[cid] = caller_number
+                self._caller_offsets.setdefault(cid, [])
+                try:
+                    _write_all(self._idx_fd, f"# {cid} {caller_number}\n".encode('utf-8'))
+                except Exception as e:
+                    print(f"⚠️ Warning: Could not register caller {caller_number} in index: {e}")
+        return cid
+
+    def _revalidate(self):
+        """
+        Reopen the aggregate log after a failed write (e.g. EBADF/ENOENT
+        because the file was deleted out from under us). Only called from
+        the background writer's error path.
+
+        Returns:
+            int: A freshly opened file descriptor
+        """
+        stale = self._agg_fd
+        self._agg_fd = os.open(self._agg_path, _LOG_OPEN_FLAGS, 0o644)
+        try:
+            os.close(stale)
+        except:
+            pass
+        return self._agg_fd
+
+    def _ensure_writer(self):
+        """Start the background writer thread on first use."""
+        if sys.is_finalizing():
+            # Thread.start() blocks forever during interpreter shutdown
+            return
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            with self._writer_start_lock:
+                if self._writer_thread is None or not self._writer_thread.is_alive():
+                    self._writer_thread = threading.Thread(
+                        target=self._writer_loop,
+                        name="call-log-writer",
+                        daemon=True
+                    )
+                    self._writer_thread.start()
+
+    def _writer_loop(self):
+        """
+        Background writer loop implementing group commit.
+        Drains batches of queued records and issues one durable O_DSYNC
+        write to the aggregate file plus one index append per batch,
+        amortizing the sync cost across all callers.
+        """
+        if self._writer_cpu is not None:
+            try:
+                os.sched_setaffinity(0, {self._writer_cpu})
+            except (AttributeError, OSError):
+                pass  # affinity is best-effort and Linux-only
+        while True:
+            try:
+                item = self._write_queue.get()
+                batch = [item]
+                # Coalesce entries arriving within the batch window
+                deadline = time.monotonic() + BATCH_WINDOW
+                while len(batch) < MAX_BATCH:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._write_queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                records = []       # (cid, record bytes) in arrival order
+                flush_events = []  # sentinels from flush_sync callers
+                for cid, payload in batch:
+                    if isinstance(payload, threading.Event):
+                        flush_events.append(payload)
+                    else:
+                        records.append((cid, payload))
+
+                if records:
+                    try:
+                        # Gather-write the batch: one syscall per IOV_MAX
+                        # records, no intermediate concatenation
+                        bufs = [record for _, record in records]
+                        # Base offset comes from the fd itself so the index
+                        # stays correct even after a reopen
+                        try:
+                            base = os.fstat(self._agg_fd).st_size
+                            _writev_all(self._agg_fd, bufs)
+                        except OSError:
+                            # Stale fd (file deleted/rotated) - reopen and retry once
+                            fd = self._revalidate()
+                            base = os.fstat(fd).st_size
+                            _writev_all(fd, bufs)
+
+                        # Record offsets in memory and in the sidecar
+                        idx_lines = []
+                        offset = base
+                        for cid, record in records:
+                            self._caller_offsets.setdefault(cid, []).append(offset)
+                            idx_lines.append(f"{cid} {offset}\n")
+                            offset += len(record)
+                        _write_all(self._idx_fd, "".join(idx_lines).encode('utf-8'))
+                    except Exception as e:
+                        # _revalidate already retried with a fresh fd; a
+                        # batch that still fails is reported and dropped
+                        print(f"ERROR: Failed to write log batch ({len(records)} entries): {e}", file=os.sys.stderr)
+
+                # Wake any flush_sync waiters now that the batch is on disk
+                for event in flush_events:
+                    event.set()
+            except Exception as e:
+                print(f"ERROR: Log writer thread error: {e}", file=os.sys.stderr)
+
+    def append_log(self, caller_number: str, log_data: Union[str, bytes], include_timestamp: bool = True):
+        """
+        Queue a log entry for the aggregate log file.
+        The entry is encoded to UTF-8 exactly once - callers that already
+        hold bytes pass them through untouched - and all file I/O happens
+        on the background writer thread, so no fsync on the caller's path.
+
+        Args:
+            caller_number (str): The phone number of the caller
+            log_data (str | bytes): The log message to append
+            include_timestamp (bool): Whether to include timestamp in the log entry
+        """
+        try:
+            message = log_data if isinstance(log_data, bytes) else log_data.encode('utf-8')
+            ns = time.time_ns()
+            if include_timestamp:
+                sec, rem = divmod(ns, 1_000_000_000)
+                if sec != self._ts_last_sec:
+                    self._ts_prefix = time.strftime("[%Y-%m-%d %H:%M:%S", time.localtime(sec)).encode()
+                    self._ts_last_sec = sec
+                payload = b"%s.%03d] " % (self._ts_prefix, rem // 1_000_000) + message + b"\n"
+            else:
+                payload = message + b"\n"
+
+            cid = self._caller_id(caller_number)
+            record = _RECORD_HEADER.pack(len(payload), cid, ns) + payload
+            self._ensure_writer()
+            self._write_queue.put((cid, record))
+
+        except Exception as e:
+            # Fallback to stderr if logging fails
+            print(f"ERROR: Failed to log for caller {caller_number}: {e}", file=os.sys.stderr)
+
+    def flush_sync(self, caller_number: str, timeout: Optional[float] = None) -> bool:
+        """
+        Block until all entries queued so far have been written and synced.
+
+        Args:
+            caller_number (str): The phone number of the caller
+            timeout (float, optional): Max seconds to wait for the writer
+
+        Returns:
+            bool: True if the flush completed within the timeout
+        """
+        # append_log starts the writer before it queues anything, so a
+        # writer that never started (or already died) means nothing is
+        # pending - and starting one here would deadlock when called via
+        # __del__ at interpreter exit
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            return True
+        event = threading.Event()
+        self._write_queue.put((self._caller_id(caller_number), event))
+        return event.wait(timeout)
+
+
+    def log_event(self, caller_number: str, message: str, global_start_time: Optional[float] = None):
+        """
+        Log an event with optional elapsed time tracking.
+        Formatting happens on the calling thread; all file I/O is done by
+        the single dedicated writer thread, so this never blocks on disk.
+
+        Args:
+            caller_number (str): The phone number of the caller
+            message (str): The log message
+            global_start_time (float, optional): Global start time for elapsed time calculation
+        """
+        # Prepare log data, encoding once here so append_log and the
+        # writer thread only ever handle bytes
+        if global_start_time is not None:
+            elapsed = time.perf_counter() - global_start_time
+            log_data = f"[{elapsed:8.4f}s] {message}".encode('utf-8')
+        else:
+            log_data = message.encode('utf-8')
+
+        try:
+            self.append_log(caller_number, log_data, True)
+        except Exception as e:
+            print(f"ERROR: Logging failed for caller {caller_number}: {e}", file=os.sys.stderr)
+
+    def read_caller_log(self, caller_number: str) -> List[str]:
+        """
+        Reconstruct a caller's log view from the aggregate file.
+
+        Args:
+            caller_number (str): The phone number of the caller
+
+        Returns:
+            list[str]: The caller's log lines in write order
+        """
+        self.flush_sync(caller_number, timeout=1.0)
+        cid = self._caller_ids.get(caller_number)
+        if cid is None:
+            return []
+        lines = []
+        try:
+            if self._read_fd is None:
+                self._read_fd = os.open(self._agg_path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+            for offset in self._caller_offsets.get(cid, []):
+                header = os.pread(self._read_fd, _RECORD_HEADER.size, offset)
+                if len(header) < _RECORD_HEADER.size:
+                    continue
+                length, _, _ = _RECORD_HEADER.unpack(header)
+                payload = os.pread(self._read_fd, length, offset + _RECORD_HEADER.size)
+                lines.append(payload.decode('utf-8', 'replace').rstrip('\n'))
+        except Exception as e:
+            print(f"⚠️ Warning: Could not read log records for {caller_number}: {e}")
+            # Drop the cached read fd so a later call can reopen
+            if self._read_fd is not None:
+                try:
+                    os.close(self._read_fd)
+                except:
+                    pass
+                self._read_fd = None
+        return lines
+
+    def close_caller_log(self, caller_number: str):
+        """
+        Flush any pending entries for a specific caller.
+        The aggregate fd is shared, so there is no per-caller fd to close.
+
+        Args:
+            caller_number (str): The phone number of the caller
+        """
+        try:
+            self.flush_sync(caller_number, timeout=1.0)
+        except Exception as e:
+            print(f"ERROR: Failed to close log for caller {caller_number}: {e}", file=os.sys.stderr)
+
+    def close_all_logs(self):
+        """Flush pending entries and close the aggregate log files."""
+        try:
+            if self._caller_ids:
+                self.flush_sync(next(iter(self._caller_ids)), timeout=1.0)
+            for fd_attr in ('_agg_fd', '_idx_fd', '_read_fd'):
+                fd = getattr(self, fd_attr, None)
+                if fd is not None:
+                    try:
+                        os.close(fd)
+                    except:
+                        pass
+                    setattr(self, fd_attr, None)
+        except Exception as e:
+            print(f"ERROR: Failed to close logs: {e}", file=os.sys.stderr)
+
+    def __del__(self):
+        """Destructor to ensure all files are closed."""
+        self.close_all_logs()
+
+    def get_log_file_path(self, caller_number: str) -> str:
+        """
+        Get the path identifying a caller's log records.
+
+        Args:
+            caller_number (str): The phone number of the caller
+
+        Returns:
+            str: The aggregate log path suffixed with the caller id,
+                e.g. '/path/to/calls.log:42'
+        """
+        return f"{os.path.abspath(self._agg_path)}:{self._caller_id(caller_number)}"
+
+    def log_file_exists_and_has_content(self, caller_number: str) -> bool:
+        """
+        Check if a caller has any log records.
+
+        Args:
+            caller_number (str): The phone number of the caller
+
+        Returns:
+            bool: True if the caller has indexed records (or a legacy
+                per-caller log file with content), False otherwise
+        """
+        try:
+            cid = self._caller_ids.get(caller_number)
+            if cid is not None and self._caller_offsets.get(cid):
+                return True
+            # Fall back to logs written before the aggregate-file format
+            filename = self._get_log_filename(caller_number)
+            return os.path.exists(filename) and os.path.getsize(filename) > 0
+        except Exception:
+            return False
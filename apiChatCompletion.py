@@ -1,12 +1,14 @@
 import asyncio
+import atexit
 import os
-import json
+import time
+import httpx
+import orjson
 from openai import AsyncOpenAI
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 import logging
 from PHONX210.ai_call_logger import CallLogger
-from datetime import datetime
 
 logging.basicConfig(level=logging.INFO)
 
@@ -20,68 +22,241 @@ _TURN_LOG = os.path.join(_LOGS_DIR, "ai_turns.jsonl")
 _CHUNKS_LOG = os.path.join(_LOGS_DIR, "ai_chunks.log")
 _SUCCESS_LOG = os.path.join(_LOGS_DIR, "success_logs_openai.txt")
 
-_turn_lock = asyncio.Lock()
-_chunk_lock = asyncio.Lock()
-_success_lock = asyncio.Lock()
+# Shared append-only fds opened once per file. O_APPEND makes each write
+# an atomic append, so concurrent coroutines don't need a lock and we
+# avoid an open/close syscall pair per log line.
+_LOG_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC
+_TURN_LOG_FD = os.open(_TURN_LOG, _LOG_OPEN_FLAGS, 0o644)
+_CHUNKS_LOG_FD = os.open(_CHUNKS_LOG, _LOG_OPEN_FLAGS, 0o644)
+_SUCCESS_LOG_FD = os.open(_SUCCESS_LOG, _LOG_OPEN_FLAGS, 0o644)
 
+# Single-consumer log pipeline: producers enqueue (fd, line bytes) and a
+# lone consumer task performs the blocking writes, so no coroutine ever
+# waits on disk. A full queue drops the entry - these logs are
+# best-effort and dropping beats backpressure on the request path.
+# An asyncio.Queue binds to the loop it is first awaited on, so the queue
+# and consumer are recreated whenever the running loop changes (common
+# when each request or test runs under its own asyncio.run).
+_LOG_QUEUE_MAX = 8192
+_log_queue: asyncio.Queue = asyncio.Queue(maxsize=_LOG_QUEUE_MAX)
+_log_consumer_task: Optional[asyncio.Task] = None
+_log_loop: Optional[asyncio.AbstractEventLoop] = None
 
-async def _append_turn_log(messages: List[Dict[str, str]], response: str, *, streaming: bool, model: str, user_phone_number: Optional[str] = None) -> None:
-    async with _turn_lock:
+# Kernel cap on iovecs per writev call; sysconf returns -1 (rather than
+# raising) when the name is defined but has no value, so clamp it
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+
+def _writev_all(fd: int, bufs: list) -> None:
+    """Gather-write a batch of buffers, splitting at the IOV_MAX cap and
+    resuming after short writes so no log line is left torn."""
+    i = 0
+    partial = None  # unwritten tail of a partially accepted buffer
+    while partial is not None or i < len(bufs):
+        if partial is not None:
+            chunk = [partial] + bufs[i:i + _IOV_MAX - 1]
+        else:
+            chunk = bufs[i:i + _IOV_MAX]
+        written = os.writev(fd, chunk)
+        if written <= 0:
+            raise OSError(f"writev returned {written}")
+        if partial is not None:
+            if written < len(partial):
+                partial = partial[written:]
+                continue
+            written -= len(partial)
+            partial = None
+        while i < len(bufs) and written >= len(bufs[i]):
+            written -= len(bufs[i])
+            i += 1
+        if written:
+            partial = bufs[i][written:]
+            i += 1
+
+
+async def _log_consumer() -> None:
+    queue = _log_queue  # bound at spawn; a new loop spawns a new consumer
+    while True:
         try:
-            record = {
-                "timestamp": asyncio.get_event_loop().time(),
-                "model": model,
-                "streaming": bool(streaming),
-                "user_phone_number": user_phone_number,
-                "messages": messages,
-                "response": (response or ""),
-                "response_chars": len(response or ""),
-            }
-            with open(_TURN_LOG, "a", encoding="utf-8") as f:
-                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            fd, data = await queue.get()
+        except RuntimeError:
+            # Queue belongs to a defunct loop - exit quietly
+            return
+        pending = {fd: [data]}
+        # Drain whatever else has queued up and gather-write per fd, so a
+        # burst of log lines costs one writev per file instead of one
+        # write per line - and the queued buffers go to the kernel as-is,
+        # with no intermediate concatenation or copying
+        while True:
+            try:
+                fd, data = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            pending.setdefault(fd, []).append(data)
+        for fd, bufs in pending.items():
+            try:
+                _writev_all(fd, bufs)
+            except Exception:
+                # best-effort only
+                pass
+
+
+def _enqueue_log(fd: int, data: bytes) -> None:
+    global _log_queue, _log_consumer_task, _log_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No running loop (sync caller) - write directly
+        try:
+            os.write(fd, data)
         except Exception:
-            # best-effort only
             pass
+        return
+    try:
+        if loop is not _log_loop:
+            # Fresh loop: the old queue (and its consumer) died with the
+            # previous loop, so start over on this one
+            _log_queue = asyncio.Queue(maxsize=_LOG_QUEUE_MAX)
+            _log_consumer_task = None
+            _log_loop = loop
+        if _log_consumer_task is None or _log_consumer_task.done():
+            _log_consumer_task = loop.create_task(_log_consumer())
+        _log_queue.put_nowait((fd, data))
+    except asyncio.QueueFull:
+        pass  # drop rather than block the producer
 
 
-async def _append_chunk_log(seq: int, chunk_text: str, *, model: str, user_phone_number: Optional[str] = None) -> None:
-    async with _chunk_lock:
+async def _append_turn_log(messages: List[Dict[str, str]], response: str, *, streaming: bool, model: str, user_phone_number: Optional[str] = None) -> None:
+    try:
+        record = {
+            "timestamp": asyncio.get_event_loop().time(),
+            "model": model,
+            "streaming": bool(streaming),
+            "user_phone_number": user_phone_number,
+            "messages": messages,
+            "response": (response or ""),
+            "response_chars": len(response or ""),
+        }
+        # orjson serializes straight to UTF-8 bytes, several times faster
+        # than the stdlib encoder and with no separate encode pass
+        _enqueue_log(_TURN_LOG_FD, orjson.dumps(record) + b"\n")
+    except Exception:
+        # best-effort only
+        pass
+
+
+# Flush the stream-local chunk buffer once it crosses this size; the
+# remainder is flushed at end of stream
+_CHUNK_BUF_LIMIT = 65536
+
+
+class _ChunkLogger:
+    """
+    Per-stream chunk logger. The model/user prefix is encoded once at
+    stream start, so each chunk only appends its seq and text; lines
+    buffer locally and hit disk in bulk.
+    """
+
+    __slots__ = ("_prefix", "_buf")
+
+    def __init__(self, model: str, user_phone_number: Optional[str]) -> None:
+        self._prefix = f"model={model} | user={user_phone_number or ''} | seq=".encode("utf-8")
+        self._buf = bytearray()
+
+    def write(self, seq: int, chunk_text: str) -> None:
         try:
             safe_text = (chunk_text or "").replace("\n", " ").replace("\r", " ").strip()
-            line = f"model={model} | user={user_phone_number or ''} | seq={seq} | {safe_text}\n"
-            with open(_CHUNKS_LOG, "a", encoding="utf-8") as f:
-                f.write(line)
+            self._buf += self._prefix + str(seq).encode() + b" | " + safe_text.encode("utf-8") + b"\n"
+            if len(self._buf) >= _CHUNK_BUF_LIMIT:
+                self.flush()
+        except Exception:
+            # best-effort only
+            pass
+
+    def flush(self) -> None:
+        try:
+            if self._buf:
+                _enqueue_log(_CHUNKS_LOG_FD, bytes(self._buf))
+                self._buf = bytearray()
         except Exception:
             # best-effort only
             pass
 
+# Cached UTC timestamp state: the second-granularity ISO prefix only
+# changes once per second, so strftime runs at most once per second and
+# the sub-second part is integer-formatted (same scheme as CallLogger).
+_utc_cache = {"sec": 0, "prefix": ""}
+
+
+def _iso_utc() -> str:
+    ns = time.time_ns()
+    sec, rem = divmod(ns, 1_000_000_000)
+    if sec != _utc_cache["sec"]:
+        _utc_cache["prefix"] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _utc_cache["sec"] = sec
+    return f"{_utc_cache['prefix']}.{rem // 1000:06d}Z"
+
+
 async def _append_success_log(*, messages: Optional[List[Dict[str, str]]], streaming: bool, model: str, user_phone_number: Optional[str] = None) -> None:
-    async with _success_lock:
+    try:
+        ts = _iso_utc()
+        # Build a compact row representation of the outbound messages
+        row = ""
         try:
-            ts = datetime.utcnow().isoformat() + "Z"
-            # Build a compact row representation of the outbound messages
+            if messages:
+                parts = []
+                for m in messages:
+                    role = (m.get("role") or "").strip()
+                    content = (m.get("content") or "")
+                    safe_content = content.replace("\n", " ").replace("\r", " ").strip()
+                    parts.append(f"{role}:{safe_content}")
+                row = " || ".join(parts)
+                if len(row) > 1000:
+                    row = row[:1000] + "..."
+        except Exception:
             row = ""
-            try:
-                if messages:
-                    parts = []
-                    for m in messages:
-                        role = (m.get("role") or "").strip()
-                        content = (m.get("content") or "")
-                        safe_content = content.replace("\n", " ").replace("\r", " ").strip()
-                        parts.append(f"{role}:{safe_content}")
-                    row = " || ".join(parts)
-                    if len(row) > 1000:
-                        row = row[:1000] + "..."
-            except Exception:
-                row = ""
 
-            # Only success entries are written to this file
-            line = f"[{ts}] HTTP 200 | model={model} | user={user_phone_number or ''} | streaming={bool(streaming)} -> {row}\n"
-            with open(_SUCCESS_LOG, "a", encoding="utf-8") as f:
-                f.write(line)
+        # Only success entries are written to this file
+        line = f"[{ts}] HTTP 200 | model={model} | user={user_phone_number or ''} | streaming={bool(streaming)} -> {row}\n"
+        _enqueue_log(_SUCCESS_LOG_FD, line.encode("utf-8"))
+    except Exception:
+        # best-effort only
+        pass
+
+# One AsyncOpenAI (and its underlying httpx connection pool) per api key,
+# shared by every AsyncChatCompletion instance. A call surge then reuses
+# warm keep-alive connections instead of paying a TLS handshake per
+# freshly constructed instance.
+_client_cache: Dict[str, AsyncOpenAI] = {}
+
+
+def _shared_client(api_key: str) -> AsyncOpenAI:
+    client = _client_cache.get(api_key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+            ),
+        )
+        _client_cache[api_key] = client
+    return client
+
+
+@atexit.register
+def _close_shared_clients() -> None:
+    for client in _client_cache.values():
+        try:
+            asyncio.run(client.close())
         except Exception:
-            # best-effort only
             pass
+    _client_cache.clear()
+
 
 class AsyncChatCompletion:
     """
@@ -98,8 +273,38 @@ class AsyncChatCompletion:
         """
         self.api_key = api_key or "API_KEY_HERE"
         self.model = model
-        self.client = AsyncOpenAI(api_key=self.api_key)
-    
+        self.client = _shared_client(self.api_key)
+        # Fixed request parameters cached per unique combination, so the
+        # common repeat-call path skips rebuilding the kwargs dict
+        self._param_cache: Dict[tuple, Dict[str, Any]] = {}
+
+    def _request_params(self, temperature: float, max_tokens: Optional[int], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the non-messages request parameters, cached per unique
+        (temperature, max_tokens, extra kwargs) combination.
+        """
+        try:
+            key = (temperature, max_tokens, tuple(sorted(kwargs.items())))
+            # Building the tuple never raises; hashing is what fails for
+            # unhashable kwarg values (e.g. a list of stop sequences), so
+            # probe it here before the cache lookup
+            hash(key)
+        except TypeError:
+            key = None
+        if key is not None:
+            params = self._param_cache.get(key)
+            if params is not None:
+                return params
+        params = {
+            "model": self.model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+        }
+        if key is not None:
+            self._param_cache[key] = params
+        return params
+
     async def create_completion(
         self, 
         messages: List[Dict[str, str]], 
@@ -129,11 +334,8 @@ class AsyncChatCompletion:
             call_logger.log_event(user_phone_number, f"🌡️ Temperature: {temperature}, Max tokens: {max_tokens}")
             
             completion = await self.client.chat.completions.create(
-                model=self.model,
                 messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs
+                **self._request_params(temperature, max_tokens, kwargs)
             )
             end_time = asyncio.get_event_loop().time()
             completion_time = end_time - start_time
@@ -209,11 +411,8 @@ class AsyncChatCompletion:
             kwargs['stream'] = True
 
             return await self.client.chat.completions.create(
-                model=self.model,
                 messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs
+                **self._request_params(temperature, max_tokens, kwargs)
             )
         except Exception as e:
             logging.error(f"Error creating stream completion: {e}")
@@ -233,6 +432,9 @@ class AsyncChatCompletion:
         """
         stream = None
         start_time = asyncio.get_event_loop().time()
+        # Chunk-log lines buffer here and hit disk in bulk instead of one
+        # task + write per streamed token chunk
+        chunk_log = _ChunkLogger(self.model, user_phone_number)
         try:
             stream = await self.create_stream_completion(
                 messages,
@@ -249,13 +451,10 @@ class AsyncChatCompletion:
                 if content:
                     full += content
                     # Best-effort chunk log
-                    try:
-                        asyncio.create_task(_append_chunk_log(seq, content, model=self.model, user_phone_number=user_phone_number))
-                    except Exception:
-                        pass
+                    chunk_log.write(seq, content)
                     seq += 1
                     yield content
-            
+
             end_time = asyncio.get_event_loop().time()
             completion_time = end_time - start_time
             logging.info(f"Stream completed in {completion_time:.2f} seconds")
@@ -273,10 +472,17 @@ class AsyncChatCompletion:
             if call_logger:
                 call_logger.log_event(user_phone_number, f"❌ AI stream failed after {completion_time:.3f}s: {str(e)[:100]}")
             yield "An error occurred while generating the response."
+        finally:
+            # Runs on GeneratorExit too, so chunks seen before the caller
+            # hung up mid-stream still reach the log
+            chunk_log.flush()
     
     async def close(self):
-        """Close the async client connection"""
-        await self.client.close()
+        """
+        No-op retained for API compatibility. The client is shared across
+        instances and closed once at interpreter exit.
+        """
+        pass
 
 async def test_prompts_with_create_completion():
     """